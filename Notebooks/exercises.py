@@ -17,7 +17,7 @@ def download_dataset():
 
 def read_dataset():
     df = pd.read_csv(DIRECTORY, encoding="cp1252")
-    df = df.drop_duplicates()
+    df = df[~pd.util.hash_pandas_object(df, index=False).duplicated()]
     return df
 
 
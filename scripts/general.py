@@ -143,6 +143,29 @@ def plot_accidents_per_year(df_accidents_per_year: pd.DataFrame) -> plt.Axes:
     return plot
 
 
+def plot_accident_trends(df_trends: pd.DataFrame) -> plt.Axes:
+    """plotting accidents per period with rolling sum of accidents.
+    Both lines are drawn on current axes, run.py opens a new figure for each plot"""
+    ax = plt.gca()
+    sns.lineplot(
+        data=df_trends,
+        x="Period",
+        y="Accidents",
+        color="#2990EA",
+        label="Accidents",
+        ax=ax,
+    )
+    sns.lineplot(
+        data=df_trends,
+        x="Period",
+        y="Rolling_accidents",
+        color="#EA7B29",
+        label="Rolling accidents",
+        ax=ax,
+    )
+    return ax
+
+
 if __name__ == "__main__":
     df = load_dataset()
     df_processed = preprocese_dataset(df)
@@ -21,19 +21,32 @@ def unzip_file() -> None:
         zip_ref.extractall(config.KAGGLE_DATASET_EXTRACT_PATH)
 
 
+def _read_raw_csv(path: str) -> pd.DataFrame:
+    return pd.read_csv(
+        path,
+        parse_dates=["Event.Date", "Publication.Date"],
+        infer_datetime_format=True,
+        encoding="cp1252",
+        low_memory=False,
+    )
+
+
 @logger_df
 def load_dataset() -> pd.DataFrame:
     path = config.KAGGLE_DATASET_EXTRACTED_FILENAME
     if not os.path.isfile(path):
         download_kaggle_dataset()
         unzip_file()
-    df = pd.read_csv(
-        config.KAGGLE_DATASET_EXTRACTED_FILENAME,
-        parse_dates=["Event.Date", "Publication.Date"],
-        infer_datetime_format=True,
-        encoding="cp1252",
-        low_memory=False,
-    )
+    df = _read_raw_csv(path)
+    return df
+
+
+@logger_df
+def load_snapshots(paths: list) -> pd.DataFrame:
+    """Loads several raw exports (snapshots or sources) in the same format and
+    concatenates them in the given order. Paths should go from oldest to newest,
+    deduplication keeps the record from the latest snapshot"""
+    df = pd.concat([_read_raw_csv(path) for path in paths], ignore_index=True)
     return df
 
 
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 from panderas_schemas import validate_df
 from utils import logger_df
@@ -10,6 +11,28 @@ logging.basicConfig(
     level=logging.INFO,
 )
 
+DEDUPLICATION_KEY_COLUMNS = [
+    "Event_Date",
+    "Accident_Number",
+    "Registration_Number",
+    "Make",
+    "Model",
+]
+INJURY_SEVERITY_ORDER = [
+    "Fatal",
+    "Serious",
+    "Minor",
+    "NonFatal",
+    "Incident",
+    "Unavailable",
+]
+INJURY_COLUMNS = [
+    "Total_Fatal_Injuries",
+    "Total_Serious_Injuries",
+    "Total_Minor_Injuries",
+    "Total_Uninjured",
+]
+
 
 @logger_df
 def _column_name_replacement(
@@ -55,22 +78,86 @@ def _timedelta_between_accident_and_publication(df: pd.DataFrame) -> pd.DataFram
 
 @logger_df
 def _add_sum_of_total_people_in_accident(df: pd.DataFrame) -> pd.DataFrame:
-    sum_of_people = df[
-        [
-            "Total_Fatal_Injuries",
-            "Total_Serious_Injuries",
-            "Total_Minor_Injuries",
-            "Total_Uninjured",
-        ]
-    ].agg(["sum"], axis=1)
+    sum_of_people = df[INJURY_COLUMNS].agg(["sum"], axis=1)
     return df.assign(Total_people_in_accident=sum_of_people)
 
 
+def _normalize_key_column(column: pd.Series) -> pd.Series:
+    """Normalizes values so formatting differences between sources do not matter"""
+    if pd.api.types.is_datetime64_any_dtype(column):
+        return column.dt.normalize()
+    normalized = column.astype("string").str.lower().str.replace(r"\W", "", regex=True)
+    return normalized.replace("", pd.NA)
+
+
+def _hash_rows(df: pd.DataFrame) -> pd.Series:
+    """Returns 64-bit fingerprint of each row"""
+    return pd.util.hash_pandas_object(df, index=False)
+
+
+@logger_df
+def _drop_duplicate_records(
+    df: pd.DataFrame, key_columns: list = DEDUPLICATION_KEY_COLUMNS
+) -> pd.DataFrame:
+    """Drops exact duplicates and near duplicates (same normalized key columns).
+    Rows with a missing key value can only be exact duplicates, so different
+    aircraft without e.g. registration number are not merged.
+    Last occurrence is kept, so when snapshots are concatenated oldest first
+    (see load_snapshots), revised records from later snapshots win"""
+    exact_duplicates = _hash_rows(df).duplicated(keep="last").to_numpy()
+    normalized_keys = df[key_columns].apply(_normalize_key_column)
+    complete_keys = normalized_keys.notna().all(axis=1).to_numpy()
+    near_duplicates = np.zeros(len(df), dtype=bool)
+    near_duplicates[complete_keys] = (
+        _hash_rows(normalized_keys[complete_keys]).duplicated(keep="last").to_numpy()
+    )
+    logging.info(
+        f"Found {exact_duplicates.sum()} exact and "
+        f"{(near_duplicates & ~exact_duplicates).sum()} near duplicate records"
+    )
+    return df[~(exact_duplicates | near_duplicates)]
+
+
+def _event_injury_severity(df: pd.DataFrame, events: pd.DataFrame) -> pd.Series:
+    """Returns most severe Injury_Severity of each event aircraft, consistent
+    with summed fatal injuries. Unknown values keep the first aircraft value"""
+    severity_rank = df["Injury_Severity"].map(
+        {severity: rank for rank, severity in enumerate(INJURY_SEVERITY_ORDER)}
+    )
+    event_rank = severity_rank.groupby(df["Event_Id"], sort=False).min()
+    severity = event_rank.map(dict(enumerate(INJURY_SEVERITY_ORDER)))
+    if "Total_Fatal_Injuries" in events.columns:
+        severity = severity.mask(events["Total_Fatal_Injuries"] > 0, "Fatal")
+    return severity.fillna(events["Injury_Severity"])
+
+
+@logger_df
+def merge_aircraft_records_to_events(df: pd.DataFrame) -> pd.DataFrame:
+    """Merges one row per aircraft records to one row per event.
+    Injury totals are summed and Injury_Severity is the most severe of all
+    aircraft ("Fatal" if summed fatal injuries > 0). Aircraft columns (Make,
+    Model, Registration_Number, Aircraft_damage, Engine_Type etc.) and all other
+    columns are taken from the first aircraft record of the event"""
+    injury_columns = [
+        column
+        for column in INJURY_COLUMNS + ["Total_people_in_accident"]
+        if column in df.columns
+    ]
+    grouped = df.groupby("Event_Id", sort=False)
+    events = df.drop_duplicates("Event_Id").set_index("Event_Id")
+    events[injury_columns] = grouped[injury_columns].sum(min_count=1)
+    if "Injury_Severity" in df.columns:
+        events["Injury_Severity"] = _event_injury_severity(df, events)
+    events = events.assign(Aircraft_count=grouped.size())
+    return events.reset_index()
+
+
 @logger_df
 def preprocese_dataset(df: pd.DataFrame) -> pd.DataFrame:
     df_processed = (
         df.pipe(_column_name_replacement, ".", "_")
         .pipe(validate_df)
+        .pipe(_drop_duplicate_records)
         .pipe(_separate_city_and_state)
         .pipe(_create_year_and_month_column_from_date)
         .pipe(_remove_symbols_and_digits_from_column, "Injury_Severity")
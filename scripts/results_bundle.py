@@ -0,0 +1,159 @@
+import contextlib
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import os
+import time
+from datetime import datetime, timezone
+
+import config
+
+logging.basicConfig(
+    filename=config.LOGGER_FILENAME,
+    format="%(asctime)s %(levelname)-8s %(message)s",
+    level=logging.INFO,
+)
+
+SCRIPTS_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+ANALYSIS_SOURCES = [
+    os.path.join(SCRIPTS_DIRECTORY, filename)
+    for filename in ["general.py", "trends.py", "run.py"]
+]
+
+_staged_results = {}
+
+
+@functools.lru_cache(maxsize=None)
+def _cached_file_fingerprint(path: str, modified: int, size: int) -> str:
+    sha = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def file_fingerprint(path: str) -> str:
+    """Returns hash of file content. File is read again only if it was modified"""
+    stat = os.stat(path)
+    return _cached_file_fingerprint(path, stat.st_mtime_ns, stat.st_size)
+
+
+def result_fingerprint(
+    input_path: str, func, args: tuple = (), sources: list = ANALYSIS_SOURCES
+) -> str:
+    """Returns hash of input data, function and arguments. Source code of the
+    module defining func and of all analysis modules it may call is included"""
+    func = inspect.unwrap(func)
+    source_paths = {os.path.abspath(inspect.getsourcefile(func)), *sources}
+    sha = hashlib.sha256()
+    sha.update(file_fingerprint(input_path).encode())
+    for source_path in sorted(source_paths):
+        sha.update(file_fingerprint(source_path).encode())
+    sha.update(f"{func.__module__}.{func.__qualname__}{args!r}".encode())
+    return sha.hexdigest()
+
+
+def load_manifest(manifest_path: str = config.RESULTS_MANIFEST) -> dict:
+    """Returns manifest with bundle version and fingerprints of saved results"""
+    try:
+        with open(manifest_path) as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {"version": 0, "results": {}}
+
+
+def is_result_unchanged(
+    path: str, fingerprint: str, manifest_path: str = config.RESULTS_MANIFEST
+) -> bool:
+    """Checks if result saved to path was made with the same fingerprint"""
+    entry = load_manifest(manifest_path)["results"].get(path, {})
+    return entry.get("fingerprint") == fingerprint and os.path.isfile(path)
+
+
+def _tmp_path(path: str) -> str:
+    """Returns temporary file path next to path, keeping the file extension"""
+    directory, filename = os.path.split(path)
+    extension = os.path.splitext(filename)[1]
+    return os.path.join(directory, f".{filename}.{os.getpid()}.tmp{extension}")
+
+
+def _atomic_write(path: str, write_func) -> None:
+    """Writes to a temporary file next to path and replaces path with it,
+    so readers never see a partially written file"""
+    tmp_path = _tmp_path(path)
+    try:
+        write_func(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def stage_result(path: str, fingerprint: str, write_func) -> None:
+    """Writes result with write_func(tmp_path) to a temporary file.
+    Staged results are moved into place by publish_results"""
+    tmp_path = _tmp_path(path)
+    try:
+        write_func(tmp_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    _staged_results[path] = (tmp_path, fingerprint)
+
+
+@contextlib.contextmanager
+def _manifest_lock(manifest_path: str, timeout: float = 60):
+    """Lock file around manifest updates, so parallel runs are serialized"""
+    lock_path = manifest_path + ".lock"
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            lock = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            break
+        except FileExistsError:
+            if time.monotonic() > deadline:
+                raise TimeoutError(
+                    f"Could not lock {manifest_path}. "
+                    f"Remove {lock_path} if no other run is active"
+                )
+            time.sleep(0.1)
+    try:
+        yield
+    finally:
+        os.close(lock)
+        os.remove(lock_path)
+
+
+def publish_results(manifest_path: str = config.RESULTS_MANIFEST) -> None:
+    """Moves all staged results into place and records them in the manifest
+    as one new bundle version. Manifest is replaced last, so it never points
+    to results which are not published yet"""
+    if not _staged_results:
+        return
+    with _manifest_lock(manifest_path):
+        manifest = load_manifest(manifest_path)
+        manifest["version"] += 1
+        manifest["updated_at"] = datetime.now(timezone.utc).isoformat(
+            timespec="seconds"
+        )
+        for path, (tmp_path, fingerprint) in _staged_results.items():
+            os.replace(tmp_path, path)
+            manifest["results"][path] = {
+                "fingerprint": fingerprint,
+                "version": manifest["version"],
+                "updated_at": manifest["updated_at"],
+            }
+
+        def write_manifest(tmp_path):
+            with open(tmp_path, "w") as file:
+                json.dump(manifest, file, indent=4)
+
+        _atomic_write(manifest_path, write_manifest)
+    logging.info(
+        f"Published {', '.join(_staged_results)}, "
+        f"results bundle version {manifest['version']}"
+    )
+    _staged_results.clear()
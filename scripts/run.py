@@ -9,17 +9,42 @@ from general import (
     get_accident_amount_by_period,
     get_incidents_per_year,
     get_min_max_sum_death_injuries_by_injury_groups,
+    plot_accident_trends,
     plot_accidents_amount_by_state,
     plot_accidents_per_year,
     plot_time_between_publication_and_event,
 )
-from load_and_save_airplane_accidents_dataset import load_dataset, save_to_csv
-from preprocesse_dataset import preprocese_dataset
+from load_and_save_airplane_accidents_dataset import (
+    load_dataset,
+    load_snapshots,
+    save_to_csv,
+)
+from preprocesse_dataset import merge_aircraft_records_to_events, preprocese_dataset
+from results_bundle import (
+    is_result_unchanged,
+    publish_results,
+    result_fingerprint,
+    stage_result,
+)
+from trends import get_accident_trends
+from utils import new_figure
+
 
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got: {value}")
+    return number
 
-def prepare_and_save_data():
-    df = load_dataset()
+
+def prepare_and_save_data(merge_events=False, snapshots=None):
+    if snapshots:
+        df = load_snapshots(snapshots)
+    else:
+        df = load_dataset()
     df_processed = preprocese_dataset(df)
+    if merge_events:
+        df_processed = merge_aircraft_records_to_events(df_processed)
     save_to_csv(df_processed, path=config.INTERIM_DIRECTORY)
 
 
@@ -33,20 +58,55 @@ def load_preprocessed_data(path=config.INTERIM_DIRECTORY) -> pd.DataFrame:
     return df
 
 
-def plot_show_or_save(plot: plt.Axes, how="save", filename="output/graphs/output.jpg"):
-    fig = plot.get_figure()
-    if how == "show":
-        plt.show()
-    elif how == "save":
-        fig.savefig(filename)
+def accidents_by_period_results(df: pd.DataFrame, start: int, end: int):
+    results = get_accident_amount_by_period(df, start, end)
+    return pd.DataFrame(
+        {"Start_year": start, "End_year": end, "Accidents_sum": results},
+        index=[0],
+    )
+
+
+def plot_accidents_per_year_from_data(df: pd.DataFrame) -> plt.Axes:
+    return plot_accidents_per_year(get_incidents_per_year(df))
+
+
+def plot_accident_trends_from_data(
+    df: pd.DataFrame, granularity: str, window: int
+) -> plt.Axes:
+    return plot_accident_trends(get_accident_trends(df, granularity, window))
+
+
+def plot_show_or_save(
+    plot_func, args=(), how="save", filename="output/graphs/output.jpg"
+):
+    """Plots plot_func(df, *args). Saving is skipped if input data, function
+    and arguments did not change since the figure was saved"""
+    if how == "save":
+        fingerprint = result_fingerprint(config.INTERIM_DIRECTORY, plot_func, args)
+        if is_result_unchanged(filename, fingerprint):
+            print(f"{filename} is up to date")
+            return
+    with new_figure() as fig:
+        plot_func(load_preprocessed_data(), *args)
+        if how == "show":
+            plt.show()
+        elif how == "save":
+            stage_result(filename, fingerprint, fig.savefig)
 
 
-def present_results(results, how: str, name: str) -> None:
+def present_results(func, args=(), how="save", name="output.csv") -> None:
+    """Prints or saves func(df, *args). Computation and saving are skipped
+    if input data, function and arguments did not change since last save"""
     if how == "print":
-        print(results)
-    else:
-        path = config.PROCESSED_DIRECTORY
-        save_to_csv(results, path, name)
+        print(func(load_preprocessed_data(), *args))
+        return
+    path = config.PROCESSED_DIRECTORY + name
+    fingerprint = result_fingerprint(config.INTERIM_DIRECTORY, func, args)
+    if is_result_unchanged(path, fingerprint):
+        print(f"{path} is up to date")
+        return
+    results = func(load_preprocessed_data(), *args)
+    stage_result(path, fingerprint, lambda tmp_path: save_to_csv(results, tmp_path))
 
 
 if __name__ == "__main__":
@@ -61,6 +121,16 @@ if __name__ == "__main__":
         help="Datased is preprocessed and saved to data/interim",
         action="store_true",
     )
+    parser.add_argument(
+        "--snapshots",
+        nargs="+",
+        help="Raw exports to deduplicate and prepare together instead of the kaggle dataset, from oldest to newest. Use with --prepare_and_save_data",
+    )
+    parser.add_argument(
+        "--merge_events",
+        help="Merge one row per aircraft records to one row per event. Use with --prepare_and_save_data",
+        action="store_true",
+    )
     parser.add_argument(
         "--get_accidents_by_period",
         help="Calculate amount of accidents per given period. Requires prepared data. See --load_and_save_data",
@@ -84,59 +154,98 @@ if __name__ == "__main__":
         help="Calculate airplane indicents sum per year",
         action="store_true",
     )
+    parser.add_argument(
+        "--get_accident_trends",
+        help="Calculate weekly, monthly or yearly accidents, fatalities, rolling and expanding sums, year over year deltas and fatality rate",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--granularity",
+        type=str,
+        default="monthly",
+        choices=["weekly", "monthly", "yearly"],
+    )
+    parser.add_argument("--window", type=positive_int, default=12)
 
     parser.add_argument("--visualise_accidents_amount_by_state", action="store_true")
     parser.add_argument(
         "--visualise_time_between_publication_and_event", action="store_true"
     )
     parser.add_argument("--visualise_accidents_per_year", action="store_true")
+    parser.add_argument("--visualise_accident_trends", action="store_true")
     parser.add_argument("--how", type=str)
     args = parser.parse_args()
 
-    if args.download_dataset:
-        load_dataset()
-
-    if args.prepare_and_save_data:
-        prepare_and_save_data()
-
-    if args.get_accidents_by_period:
-        df = load_preprocessed_data()
-        results = get_accident_amount_by_period(df, args.start, args.end)
-        results_df = pd.DataFrame(
-            {"Start_year": args.start, "End_year": args.end, "Accidents_sum": results},
-            index=[0],
-        )
-        present_results(results_df, args.how, name="Indicents_per_year.csv")
-
-    if args.get_statistics_airplane_make_engine_flight_purpose:
-        df = load_preprocessed_data()
-        results = accident_statistics_by_airplane_make_engine_flight_purpose(df)
-        present_results(results, args.how, name="Statistics_make_engine_purpose.csv")
-
-    if args.visualise_accidents_amount_by_state:
-        df = load_preprocessed_data()
-        plot = plot_accidents_amount_by_state(df)
-        plot_show_or_save(plot, args.how, filename="output/graphs/state.jpg")
-
-    if args.visualise_time_between_publication_and_event:
-        df = load_preprocessed_data()
-        plot = plot_time_between_publication_and_event(df)
-        plot_show_or_save(plot, args.how, filename="output/graphs/timedelta.jpg")
-
-    if args.visualise_accidents_per_year:
-        df = load_preprocessed_data()
-        accidents_per_year_df = get_incidents_per_year(df)
-        plot = plot_accidents_per_year(accidents_per_year_df)
-        plot_show_or_save(
-            plot, args.how, filename="output/graphs/accidents_per_year.jpg"
-        )
-
-    if args.get_injury_statistics:
-        df = load_preprocessed_data()
-        results = get_min_max_sum_death_injuries_by_injury_groups(df)
-        present_results(results, args.how, name="Injury_statistics.csv")
-
-    if args.get_accidents_sum_by_year:
-        df = load_preprocessed_data()
-        results = get_incidents_per_year(df)
-        present_results(results, args.how, name="Accidents_sum_by_year.csv")
+    # Saved results are published together as one results bundle version
+    try:
+        if args.download_dataset:
+            load_dataset()
+
+        if args.prepare_and_save_data:
+            prepare_and_save_data(args.merge_events, args.snapshots)
+
+        if args.get_accidents_by_period:
+            present_results(
+                accidents_by_period_results,
+                (args.start, args.end),
+                args.how,
+                name="Indicents_per_year.csv",
+            )
+
+        if args.get_statistics_airplane_make_engine_flight_purpose:
+            present_results(
+                accident_statistics_by_airplane_make_engine_flight_purpose,
+                how=args.how,
+                name="Statistics_make_engine_purpose.csv",
+            )
+
+        if args.visualise_accidents_amount_by_state:
+            plot_show_or_save(
+                plot_accidents_amount_by_state,
+                how=args.how,
+                filename="output/graphs/state.jpg",
+            )
+
+        if args.visualise_time_between_publication_and_event:
+            plot_show_or_save(
+                plot_time_between_publication_and_event,
+                how=args.how,
+                filename="output/graphs/timedelta.jpg",
+            )
+
+        if args.visualise_accidents_per_year:
+            plot_show_or_save(
+                plot_accidents_per_year_from_data,
+                how=args.how,
+                filename="output/graphs/accidents_per_year.jpg",
+            )
+
+        if args.get_injury_statistics:
+            present_results(
+                get_min_max_sum_death_injuries_by_injury_groups,
+                how=args.how,
+                name="Injury_statistics.csv",
+            )
+
+        if args.get_accidents_sum_by_year:
+            present_results(
+                get_incidents_per_year, how=args.how, name="Accidents_sum_by_year.csv"
+            )
+
+        if args.get_accident_trends:
+            present_results(
+                get_accident_trends,
+                (args.granularity, args.window),
+                args.how,
+                name=f"Accident_trends_{args.granularity}.csv",
+            )
+
+        if args.visualise_accident_trends:
+            plot_show_or_save(
+                plot_accident_trends_from_data,
+                (args.granularity, args.window),
+                args.how,
+                filename=f"output/graphs/accident_trends_{args.granularity}.jpg",
+            )
+    finally:
+        publish_results()
@@ -4,7 +4,10 @@ from preprocesse_dataset import (
     _remove_symbols_and_digits_from_column,
     _separate_city_and_state,
     _column_name_replacement,
+    _drop_duplicate_records,
+    merge_aircraft_records_to_events,
 )
+import numpy as np
 import pandas as pd
 
 
@@ -86,3 +89,93 @@ def test_column_name_replacement():
         }
     )
     pd.testing.assert_frame_equal(_column_name_replacement(df, ".", "_"), df_expected)
+
+
+def test_drop_exact_and_near_duplicate_records():
+    df = pd.DataFrame(
+        {
+            "Event_Date": [pd.Timestamp(2022, 1, 1)] * 3 + [pd.Timestamp(2022, 1, 2)],
+            "Accident_Number": [
+                "ERA22LA001",
+                "ERA22LA001",
+                "era22-la001",
+                "ERA22LA002",
+            ],
+            "Registration_Number": ["N123", "N123", "n123", "N123"],
+            "Make": ["Cessna", "Cessna", "CESSNA", "Cessna"],
+            "Model": ["172", "172", "172", "172"],
+        }
+    )
+    pd.testing.assert_frame_equal(_drop_duplicate_records(df), df.iloc[[2, 3]])
+
+
+def test_records_with_missing_key_are_only_exact_duplicates():
+    df = pd.DataFrame(
+        {
+            "Event_Date": [pd.Timestamp(2022, 1, 1)] * 3,
+            "Accident_Number": ["ERA22LA001"] * 3,
+            "Registration_Number": [np.nan, np.nan, np.nan],
+            "Make": ["Cessna"] * 3,
+            "Model": ["172"] * 3,
+            "Total_Fatal_Injuries": [2.0, 3.0, 3.0],
+        }
+    )
+    pd.testing.assert_frame_equal(_drop_duplicate_records(df), df.iloc[[0, 2]])
+
+
+def test_revised_record_from_later_snapshot_is_kept():
+    old_snapshot = pd.DataFrame(
+        {
+            "Event_Date": [pd.Timestamp(2022, 1, 1), pd.Timestamp(2022, 1, 2)],
+            "Accident_Number": ["ERA22LA001", "ERA22LA002"],
+            "Registration_Number": ["N123", "N456"],
+            "Make": ["Cessna", "Piper"],
+            "Model": ["172", "PA-28"],
+            "Total_Fatal_Injuries": [1.0, 0.0],
+        }
+    )
+    new_snapshot = old_snapshot.iloc[[0]].assign(Total_Fatal_Injuries=2.0)
+    df = pd.concat([old_snapshot, new_snapshot], ignore_index=True)
+    pd.testing.assert_frame_equal(_drop_duplicate_records(df), df.iloc[[1, 2]])
+
+
+def test_merge_aircraft_records_to_events():
+    df = pd.DataFrame(
+        {
+            "Event_Id": ["A", "B", "A"],
+            "Make": ["Cessna", "Piper", "Boeing"],
+            "Model": [np.nan, "PA-28", "737"],
+            "Total_Fatal_Injuries": [1.0, 0.0, 2.0],
+            "Total_Uninjured": [np.nan, 3.0, np.nan],
+        }
+    )
+    df_expected = pd.DataFrame(
+        {
+            "Event_Id": ["A", "B"],
+            "Make": ["Cessna", "Piper"],
+            "Model": [np.nan, "PA-28"],
+            "Total_Fatal_Injuries": [3.0, 0.0],
+            "Total_Uninjured": [np.nan, 3.0],
+            "Aircraft_count": [2, 1],
+        }
+    )
+    pd.testing.assert_frame_equal(merge_aircraft_records_to_events(df), df_expected)
+
+
+def test_merge_mixed_severity_event_is_fatal():
+    df = pd.DataFrame(
+        {
+            "Event_Id": ["A", "A", "B", "B"],
+            "Injury_Severity": ["NonFatal", "Fatal", "Incident", "Minor"],
+            "Total_Fatal_Injuries": [0.0, 2.0, np.nan, 0.0],
+        }
+    )
+    df_expected = pd.DataFrame(
+        {
+            "Event_Id": ["A", "B"],
+            "Injury_Severity": ["Fatal", "Minor"],
+            "Total_Fatal_Injuries": [2.0, 0.0],
+            "Aircraft_count": [2, 2],
+        }
+    )
+    pd.testing.assert_frame_equal(merge_aircraft_records_to_events(df), df_expected)
@@ -0,0 +1,94 @@
+import importlib.util
+
+import matplotlib.pyplot as plt
+import pandas as pd
+from results_bundle import (
+    is_result_unchanged,
+    load_manifest,
+    publish_results,
+    result_fingerprint,
+    stage_result,
+)
+from utils import new_figure
+
+
+def _import_module(path):
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_result_fingerprint_changes_with_function_source(tmp_path):
+    input_path = tmp_path / "input.csv"
+    input_path.write_text("Count\n1\n")
+    module_path = tmp_path / "analysis.py"
+    module_path.write_text(
+        "from utils import logger_df\n\n\n"
+        "@logger_df\n"
+        "def get_result(df):\n"
+        "    return df\n"
+    )
+    module = _import_module(module_path)
+    fingerprint = result_fingerprint(str(input_path), module.get_result, (1,))
+    assert fingerprint == result_fingerprint(str(input_path), module.get_result, (1,))
+    assert fingerprint != result_fingerprint(str(input_path), module.get_result, (2,))
+
+    module_path.write_text(
+        "from utils import logger_df\n\n\n"
+        "@logger_df\n"
+        "def get_result(df):\n"
+        "    return df.head()\n"
+    )
+    module = _import_module(module_path)
+    assert fingerprint != result_fingerprint(str(input_path), module.get_result, (1,))
+
+
+def test_publish_results_and_skip_if_unchanged(tmp_path):
+    path = str(tmp_path / "result.csv")
+    other_path = str(tmp_path / "other.csv")
+    manifest_path = str(tmp_path / "manifest.json")
+
+    def write_func(tmp_file):
+        with open(tmp_file, "w") as file:
+            file.write("Count\n1\n")
+
+    assert not is_result_unchanged(path, "abc", manifest_path)
+    stage_result(path, "abc", write_func)
+    stage_result(other_path, "xyz", write_func)
+    assert not is_result_unchanged(path, "abc", manifest_path)
+    publish_results(manifest_path)
+    assert is_result_unchanged(path, "abc", manifest_path)
+    assert is_result_unchanged(other_path, "xyz", manifest_path)
+    assert not is_result_unchanged(path, "def", manifest_path)
+    assert load_manifest(manifest_path)["version"] == 1
+
+    stage_result(path, "def", write_func)
+    publish_results(manifest_path)
+    manifest = load_manifest(manifest_path)
+    assert manifest["version"] == 2
+    assert manifest["results"][path]["fingerprint"] == "def"
+    assert manifest["results"][other_path]["version"] == 1
+    assert sorted(file.name for file in tmp_path.iterdir()) == [
+        "manifest.json",
+        "other.csv",
+        "result.csv",
+    ]
+
+
+def test_staged_plots_are_drawn_on_separate_figures(tmp_path):
+    manifest_path = str(tmp_path / "manifest.json")
+    figures = []
+    for name, values in [("first.jpg", [1, 2, 3]), ("second.jpg", [3, 2])]:
+        with new_figure() as fig:
+            pd.Series(values).plot()
+            stage_result(str(tmp_path / name), name, fig.savefig)
+            figures.append(fig)
+    publish_results(manifest_path)
+
+    first, second = figures
+    assert first is not second
+    assert len(second.axes) == 1
+    assert [list(line.get_ydata()) for line in second.axes[0].lines] == [[3, 2]]
+    assert plt.get_fignums() == []
+    assert (tmp_path / "second.jpg").is_file()
@@ -0,0 +1,101 @@
+import trends
+from trends import (
+    add_rolling_window,
+    add_year_over_year_delta,
+    get_accident_time_series,
+)
+import numpy as np
+import pandas as pd
+import pytest
+
+
+def test_get_monthly_accident_time_series():
+    df = pd.DataFrame(
+        {
+            "Event_Date": [
+                pd.Timestamp(2022, 3, 5),
+                pd.Timestamp(2022, 1, 1),
+                pd.Timestamp(2022, 1, 20),
+            ],
+            "Total_Fatal_Injuries": [1.0, 2.0, np.nan],
+            "Total_people_in_accident": [4.0, 2.0, 3.0],
+        }
+    )
+    df_expected = pd.DataFrame(
+        {
+            "Period": [
+                pd.Timestamp(2022, 1, 1),
+                pd.Timestamp(2022, 2, 1),
+                pd.Timestamp(2022, 3, 1),
+            ],
+            "Accidents": [2, 0, 1],
+            "Fatalities": [2.0, 0.0, 1.0],
+            "People": [5.0, 0.0, 4.0],
+            "Fatality_rate": [0.4, np.nan, 0.25],
+        }
+    )
+    pd.testing.assert_frame_equal(
+        get_accident_time_series(df, "monthly"), df_expected, check_dtype=False
+    )
+
+
+def test_time_series_cache_skips_rebuild_and_is_bounded(monkeypatch):
+    builds = []
+
+    def counting_build(df, freq):
+        builds.append(freq)
+        return build_time_series(df, freq)
+
+    build_time_series = trends._build_time_series
+    monkeypatch.setattr(trends, "_build_time_series", counting_build)
+    monkeypatch.setattr(trends, "_time_series_cache", trends.OrderedDict())
+
+    def make_df(fatalities):
+        return pd.DataFrame(
+            {
+                "Event_Date": [pd.Timestamp(2022, 1, 1)],
+                "Total_Fatal_Injuries": [fatalities],
+                "Total_people_in_accident": [4.0],
+            }
+        )
+
+    get_accident_time_series(make_df(1.0), "monthly")
+    get_accident_time_series(make_df(1.0), "monthly")
+    assert builds == ["M"]
+
+    for fatalities in range(2, 2 + trends.TIME_SERIES_CACHE_SIZE):
+        get_accident_time_series(make_df(float(fatalities)), "monthly")
+    assert len(trends._time_series_cache) == trends.TIME_SERIES_CACHE_SIZE
+    get_accident_time_series(make_df(1.0), "monthly")
+    assert len(builds) == 2 + trends.TIME_SERIES_CACHE_SIZE
+
+
+def test_add_rolling_window():
+    df = pd.DataFrame(
+        {
+            "Accidents": [1, 2, 3],
+            "Fatalities": [0.0, 2.0, 1.0],
+            "People": [1.0, 4.0, 6.0],
+        }
+    )
+    df_expected = df.assign(
+        Rolling_accidents=[np.nan, 3.0, 5.0],
+        Rolling_fatalities=[np.nan, 2.0, 3.0],
+        Rolling_fatality_rate=[np.nan, 0.4, 0.3],
+    )
+    pd.testing.assert_frame_equal(add_rolling_window(df, 2), df_expected)
+
+
+def test_add_rolling_window_rejects_non_positive_window():
+    df = pd.DataFrame({"Accidents": [1], "Fatalities": [0.0], "People": [1.0]})
+    with pytest.raises(ValueError):
+        add_rolling_window(df, 0)
+
+
+def test_add_year_over_year_delta():
+    df = pd.DataFrame({"Accidents": [5, 7, 4], "Fatalities": [1.0, 3.0, 2.0]})
+    df_expected = df.assign(
+        Accidents_yoy_delta=[np.nan, 2.0, -3.0],
+        Fatalities_yoy_delta=[np.nan, 2.0, -1.0],
+    )
+    pd.testing.assert_frame_equal(add_year_over_year_delta(df, "yearly"), df_expected)
@@ -0,0 +1,172 @@
+import hashlib
+import logging
+from collections import OrderedDict
+
+import config
+import numpy as np
+import pandas as pd
+from utils import logger_df
+
+logging.basicConfig(
+    filename=config.LOGGER_FILENAME,
+    format="%(asctime)s %(levelname)-8s %(message)s",
+    level=logging.INFO,
+)
+
+GRANULARITIES = {"weekly": "W", "monthly": "M", "yearly": "Y"}
+PERIODS_PER_YEAR = {"W": 52, "M": 12, "Y": 1}
+
+TIME_SERIES_CACHE_SIZE = 4
+
+_time_series_cache = OrderedDict()
+
+
+def _get_freq(granularity: str) -> str:
+    if granularity not in GRANULARITIES:
+        raise ValueError(
+            f"Unknown granularity: {granularity}. Choose from {', '.join(GRANULARITIES)}"
+        )
+    return GRANULARITIES[granularity]
+
+
+def _to_event_dates(column: pd.Series) -> pd.Series:
+    """Parses event dates (also from csv strings) to timezone naive timestamps"""
+    dates = pd.to_datetime(column, utc=True)
+    return dates.dt.tz_convert(None)
+
+
+def _fingerprint(df: pd.DataFrame) -> str:
+    """Returns hash of the columns used to build time series"""
+    hashed = pd.util.hash_pandas_object(
+        df[["Event_Date", "Total_Fatal_Injuries", "Total_people_in_accident"]],
+        index=False,
+    )
+    return hashlib.sha1(hashed.values.tobytes()).hexdigest()
+
+
+def _sorted_cumulative_arrays(df: pd.DataFrame) -> tuple:
+    """Sorts events by date once and returns dates with cumulative sums of
+    accidents, fatalities and people. Cumulative arrays start with 0, so a sum
+    between positions i and j is cum[j] - cum[i]."""
+    dates = _to_event_dates(df["Event_Date"]).to_numpy()
+    fatalities = df["Total_Fatal_Injuries"].fillna(0).to_numpy(dtype=float)
+    people = df["Total_people_in_accident"].fillna(0).to_numpy(dtype=float)
+
+    valid = ~np.isnat(dates)
+    order = np.argsort(dates[valid], kind="stable")
+    dates = dates[valid][order]
+    cum_fatalities = np.concatenate(([0.0], np.cumsum(fatalities[valid][order])))
+    cum_people = np.concatenate(([0.0], np.cumsum(people[valid][order])))
+    return dates, cum_fatalities, cum_people
+
+
+def _safe_divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(denominator > 0, numerator / denominator, np.nan)
+
+
+def _build_time_series(df: pd.DataFrame, freq: str) -> pd.DataFrame:
+    dates, cum_fatalities, cum_people = _sorted_cumulative_arrays(df)
+    columns = ["Period", "Accidents", "Fatalities", "People", "Fatality_rate"]
+    if len(dates) == 0:
+        return pd.DataFrame(columns=columns)
+
+    periods = pd.period_range(
+        pd.Period(dates[0], freq=freq), pd.Period(dates[-1], freq=freq), freq=freq
+    )
+    edges = pd.period_range(periods[0], periods[-1] + 1, freq=freq).start_time
+    positions = np.searchsorted(dates, edges.to_numpy(), side="left")
+
+    fatalities = np.diff(cum_fatalities[positions])
+    people = np.diff(cum_people[positions])
+    return pd.DataFrame(
+        {
+            "Period": periods.start_time,
+            "Accidents": np.diff(positions),
+            "Fatalities": fatalities,
+            "People": people,
+            "Fatality_rate": _safe_divide(fatalities, people),
+        },
+        columns=columns,
+    )
+
+
+@logger_df
+def get_accident_time_series(
+    df: pd.DataFrame, granularity: str = "monthly"
+) -> pd.DataFrame:
+    """Returns accidents, fatalities, people and fatality rate per period.
+    Last TIME_SERIES_CACHE_SIZE results are cached per dataset and granularity,
+    so equal data loaded again in the same process is not aggregated twice.
+    Results saved across runs are reused through the results manifest"""
+    freq = _get_freq(granularity)
+    key = (_fingerprint(df), freq)
+    if key in _time_series_cache:
+        _time_series_cache.move_to_end(key)
+    else:
+        _time_series_cache[key] = _build_time_series(df, freq)
+        if len(_time_series_cache) > TIME_SERIES_CACHE_SIZE:
+            _time_series_cache.popitem(last=False)
+    return _time_series_cache[key].copy()
+
+
+def _rolling_sum(values: np.ndarray, window: int) -> np.ndarray:
+    """Rolling sum from cumulative sums, first window-1 values are NaN"""
+    cumulative = np.concatenate(([0.0], np.cumsum(values, dtype=float)))
+    result = np.full(len(values), np.nan)
+    start = window - 1
+    result[start:] = cumulative[window:] - cumulative[:-window]
+    return result
+
+
+@logger_df
+def add_rolling_window(df_series: pd.DataFrame, window: int = 12) -> pd.DataFrame:
+    """Adds rolling sums of accidents and fatalities and rolling fatality rate"""
+    if window < 1:
+        raise ValueError(f"Rolling window must be at least 1, got: {window}")
+    rolling_fatalities = _rolling_sum(df_series["Fatalities"].to_numpy(), window)
+    rolling_people = _rolling_sum(df_series["People"].to_numpy(), window)
+    return df_series.assign(
+        Rolling_accidents=_rolling_sum(df_series["Accidents"].to_numpy(), window),
+        Rolling_fatalities=rolling_fatalities,
+        Rolling_fatality_rate=_safe_divide(rolling_fatalities, rolling_people),
+    )
+
+
+@logger_df
+def add_expanding_window(df_series: pd.DataFrame) -> pd.DataFrame:
+    """Adds running totals of accidents and fatalities and overall fatality rate"""
+    expanding_fatalities = np.cumsum(df_series["Fatalities"].to_numpy(dtype=float))
+    expanding_people = np.cumsum(df_series["People"].to_numpy(dtype=float))
+    return df_series.assign(
+        Expanding_accidents=np.cumsum(df_series["Accidents"].to_numpy()),
+        Expanding_fatalities=expanding_fatalities,
+        Expanding_fatality_rate=_safe_divide(expanding_fatalities, expanding_people),
+    )
+
+
+@logger_df
+def add_year_over_year_delta(
+    df_series: pd.DataFrame, granularity: str = "monthly"
+) -> pd.DataFrame:
+    """Adds difference to the same period one year before.
+    Weekly series are compared with the value 52 weeks before"""
+    shift = PERIODS_PER_YEAR[_get_freq(granularity)]
+    return df_series.assign(
+        Accidents_yoy_delta=df_series["Accidents"].diff(shift),
+        Fatalities_yoy_delta=df_series["Fatalities"].diff(shift),
+    )
+
+
+@logger_df
+def get_accident_trends(
+    df: pd.DataFrame, granularity: str = "monthly", window: int = 12
+) -> pd.DataFrame:
+    """Returns accident time series with rolling, expanding windows and year over year deltas"""
+    trends = (
+        get_accident_time_series(df, granularity)
+        .pipe(add_rolling_window, window)
+        .pipe(add_expanding_window)
+        .pipe(add_year_over_year_delta, granularity)
+    )
+    return trends
@@ -1,8 +1,12 @@
+import contextlib
+import functools
 import logging
+import matplotlib.pyplot as plt
 import pandas as pd
 
 
 def logger_df(func):
+    @functools.wraps(func)
     def inner(*args, **kwargs):
         logging.info(f"Started executing function: {func.__name__}")
         output = func(*args, **kwargs)
@@ -15,3 +19,14 @@ def logger_df(func):
         return output
 
     return inner
+
+
+@contextlib.contextmanager
+def new_figure():
+    """Opens a new pyplot figure as the current one and closes it afterwards,
+    so plots drawn on current axes do not end up in each other's figures"""
+    fig = plt.figure()
+    try:
+        yield fig
+    finally:
+        plt.close(fig)